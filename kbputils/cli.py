@@ -3,8 +3,8 @@ from . import converters
 from . import __version__
 import argparse
 import dataclasses
-import io
 import sys
+import warnings
 
 def convert_file():
     parser = argparse.ArgumentParser(prog='KBPUtils', description="Convert .kbp to .ass file", argument_default=argparse.SUPPRESS)
@@ -35,13 +35,22 @@ def convert_file():
     args = parser.parse_args()
     source = args.source_file
     k = kbp.KBPFile(sys.stdin if source == "-" else source)
-    dest = open(args.dest_file, 'w', encoding='utf_8_sig') if hasattr(args, 'dest_file') else io.StringIO()
+    # Stream straight to the destination instead of buffering the whole
+    # document in memory first
+    dest = open(args.dest_file, 'w', encoding='utf_8_sig') if hasattr(args, 'dest_file') else sys.stdout
     del args.source_file
     if hasattr(args, 'dest_file'):
         del args.dest_file
-    converters.AssConverter(k, **vars(args)).ass_document().dump_file(dest)
-    if type(dest) is io.StringIO:
-        print(dest.getvalue())
+    doc = converters.AssConverter(k, **vars(args)).ass_document()
+    if dest is sys.stdout:
+        # The ass module recommends writing UTF-8 with BOM, which doesn't
+        # apply when streaming to the terminal/a pipe
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            doc.dump_file(dest)
+    else:
+        doc.dump_file(dest)
+        dest.close()
 
 # Auto-generate short option based on field name
 used_shortopts=set("hV")
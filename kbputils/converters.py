@@ -2,6 +2,7 @@ import ass
 import dataclasses
 import datetime
 import enum
+import functools
 import types
 import typing
 import collections
@@ -25,6 +26,10 @@ class AssAlignment(enum.Enum):
     TOP_RIGHT = 9
     R = 9 # Alias
 
+# Plain dict lookup for the align characters used in line headers - avoids
+# EnumMeta.__getitem__ overhead on every line
+_ALIGN_ENUM = {'L': AssAlignment.L, 'C': AssAlignment.C, 'R': AssAlignment.R}
+
 @validators.validated_instantiation
 class AssPosition(typing.NamedTuple):
     rotation: int
@@ -35,11 +40,11 @@ class AssPosition(typing.NamedTuple):
     def __str__(self):
         result = "{"
         if self.alignment != AssAlignment.DEFAULT:
-            result += r"\an%d" % self.alignment.value
+            result += f"\\an{self.alignment.value}"
         if self.rotation:
-            result += r"\frz%d" % self.rotation
-        # Yes, %s, so it will stringify either an int or float and display properly
-        result += r"\pos(%s,%s)}" % (self.x, self.y)
+            result += f"\\frz{self.rotation}"
+        # Interpolation stringifies either an int or float and displays properly
+        result += f"\\pos({self.x},{self.y})}}"
         return result
 
 class AssOverflow(enum.Enum):
@@ -51,8 +56,19 @@ class AssOverflow(enum.Enum):
     def __str__(self):
         return self.name
 
+# Resolve the callable used to coerce a value to an option's annotated type -
+# the type itself if callable, otherwise the first member of a union. Used
+# once per field at class-definition time to build the coercion table.
+def _option_coercer(t):
+    if callable(t):
+        return t
+    elif hasattr(t, '__args__') and callable(s := t.__args__[0]):
+        return s
+    else:
+        return None
+
 @validators.validated_instantiation(replace="__init__")
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class AssOptions:
     #position: bool
     #wipe: bool
@@ -75,17 +91,10 @@ class AssOptions:
     @validators.validated_types
     @staticmethod
     def __assert_valid(key: str, value):
-        if key in AssOptions._fields:
-            if not isinstance(value, (t := AssOptions._fields[key].type)):
-                if callable(t):
-                    value = t(value)
-                # Also try the first type in a union
-                elif hasattr(t, '__args__') and callable(s := t.__args__[0]):
-                    value = s(value)
-            elif not isinstance(value, t):
-                raise TypeError(f"Expected {opt} to be of type {t}. Found {type(options[opt])}.")
-        else:
-            raise TypeError(f"Unexpected field '{key}'. Possible fields are {self._fields.keys()}.")
+        if (t := AssOptions._field_types.get(key)) is None:
+            raise TypeError(f"Unexpected field '{key}'. Possible fields are {AssOptions._fields.keys()}.")
+        if not isinstance(value, t) and (coerce := AssOptions._coercers[key]):
+            value = coerce(value)
 
         return value
 
@@ -96,6 +105,18 @@ class AssOptions:
 
 # Not sure why dataclasses doesn't define something like this keyed by field name
 AssOptions._fields = types.MappingProxyType(dict((f.name,f) for f in dataclasses.fields(AssOptions)))
+# Types pre-extracted so validation doesn't chase .type per call
+AssOptions._field_types = types.MappingProxyType(dict((f.name,f.type) for f in dataclasses.fields(AssOptions)))
+# Field name straight to coercion callable - validation is then a dict lookup
+# plus one isinstance rather than a callable/union cascade per call
+AssOptions._coercers = types.MappingProxyType(dict((name, _option_coercer(t)) for name, t in AssOptions._field_types.items()))
+
+# Translation table doubling each hex nibble, e.g. "5F0" -> "55FF00"
+_HEX_DOUBLE = str.maketrans({c: c + c for c in "0123456789abcdefABCDEF"})
+
+# Multiplying this beats timedelta's keyword-argument normalization path when
+# constructing event times from millisecond integers
+_MS = datetime.timedelta(milliseconds=1)
 
 class AssConverter:
     
@@ -106,10 +127,32 @@ class AssConverter:
         # providing a template for defaults then overriding items there
         self.options = options or AssOptions()
         self.options.update(**kwargs)
-
-    # Delegate to options if not present in the object itself
-    def __getattr__(self,attr):
-        return getattr(self.options, attr)
+        # Bind the resolved options directly onto the instance - one attribute
+        # hop on the hot paths instead of a __getattr__ fallback into options
+        for field in AssOptions._fields:
+            setattr(self, field, getattr(self.options, field))
+        # Layout invariants - margins and options are fixed after init, so
+        # hoist the shared parts of the per-line position arithmetic
+        margins = kbpFile.margins
+        self._cdg_res_x = 300 if self.border else 288
+        self._y_base = margins["top"] + (12 if self.border else 0)
+        self._y_stride = margins["spacing"] + (kbpfont.spacing(kbpFile.styles[1]) if self.experimental_spacing else 19)
+        self._x_left = margins["left"] + (6 if self.border else 0)
+        self._x_right = self._cdg_res_x - margins["right"] - (6 if self.border else 0)
+        # Fade tag only depends on the (now fixed) fade options
+        self._fade = self.fade()
+        # Per style-letter lookup cache, filled lazily by _style_info
+        self._style_cache = {}
+
+    # Resolve a line header's style letter to (ass style name, fixed flag),
+    # cached so repeated lines don't re-run the collection lookup. Lazy because
+    # undefined styles fall back to the default and fixed variants are
+    # auto-vivified on first access.
+    def _style_info(self, alpha):
+        if (info := self._style_cache.get(alpha)) is None:
+            style = self.kbpFile.styles[alpha]
+            info = self._style_cache[alpha] = (AssConverter.ass_style_name(style.style_no, style.name), style.fixed)
+        return info
 
     # Move coordinates based on scaling the canvas size
     # If the target aspect ratio is wider than 300:216, x coordinates are
@@ -143,8 +186,11 @@ class AssConverter:
     # These are scaled by a factor of the minimum of the scaling factor of x
     # and y to avoid going off screen
     # If font is true, additional scaling factor of 1.4 is applied to account for line height vs cap height
-    @validators.validated_types
+    # Pure math over a handful of distinct inputs per conversion, so memoize
+    # like kbp2asscolor
     @staticmethod
+    @functools.lru_cache(maxsize=256)
+    @validators.validated_types
     def rescale_scalar(size: float, target_x: int, target_y: int, allow_float: bool = True, border: bool = True, font: bool = False) -> int | float:
         cdg_res = (300, 216) if border else (288, 192)
         scale = min(target_x / cdg_res[0], target_y / cdg_res[1])
@@ -153,22 +199,17 @@ class AssConverter:
 
     @validators.validated_types
     def get_pos(self, line: kbp.KBPLine, num: int) -> AssPosition:
-        cdg_res_x = 300 if self.border else 288
-        margins = self.kbpFile.margins
         result = {}
-        y = margins["top"] + \
-            line.down + \
-            num * (self.kbpFile.margins["spacing"] + (kbpfont.spacing(self.kbpFile.styles[1]) if self.experimental_spacing else 19)) + \
-            (12 if self.border else 0)
+        y = self._y_base + line.down + num * self._y_stride
 
-        result["alignment"] = AssAlignment.DEFAULT if line.align == self.style_alignments[line.style] else AssAlignment[line.align]
+        result["alignment"] = AssAlignment.DEFAULT if line.align == self.style_alignments[line.style] else _ALIGN_ENUM[line.align]
 
         if line.align == 'L':
-            x = margins["left"] + line.right + (6 if self.border else 0)
+            x = self._x_left + line.right
         elif line.align == 'C':
-            x = cdg_res_x / 2 + line.right
+            x = self._cdg_res_x / 2 + line.right
         else: #line.align == 'R' or the file is broken
-            x = cdg_res_x - margins["right"] + line.right - (6 if self.border else 0)
+            x = self._x_right + line.right
 
         result["x"], result["y"] = AssConverter.rescale_coords(x, y, self.target_x, self.target_y, border=self.border, allow_float=self.float_pos)
 
@@ -191,41 +232,45 @@ class AssConverter:
     # Determine the most-used line alignment for each style to minimize \anX tags in result
     # (since alignment is not part of the KBP style, but is part of the ASS style)
     def _calc_style_alignments(self):
-        # dict of alpha-keyed style to dict of alignment to frequency
-        # E.g.
-        # { 'A' : {'C': 5, 'L': 2}}
+        # Counter of alignment frequency per alpha-keyed style - e.g.
+        # { 'A' : Counter({'C': 5, 'L': 2}) }
         # would indicate style A was centered 5 times and left-aligned twice
-        freqs = collections.defaultdict(lambda: collections.defaultdict(lambda: 0))
+        freqs = collections.defaultdict(collections.Counter)
         for page in self.kbpFile.pages:
             for line in page.lines:
                 freqs[line.style][line.align] += 1
-        self.style_alignments = {}
-        for style in freqs:
-            self.style_alignments[style] = max(freqs[style], key = freqs[style].get)
+        self.style_alignments = {style: counts.most_common(1)[0][0] for style, counts in freqs.items()}
 
     @validators.validated_types
     def fade(self) -> str:
-        return r"{\fad(%d,%d)}" % (self.options.fade_in, self.options.fade_out)
+        return f"{{\\fad({self.options.fade_in},{self.options.fade_out})}}"
 
     # Convert a line of syllables into the text of a dialogue event including wipe tags
     @validators.validated_types
     def kbp2asstext(self, line: kbp.KBPLine, pos: AssPosition):
-        result = str(pos) + self.fade()
-        if self.kbpFile.styles[line.style].fixed:
-            return result + line.text()
+        if self._style_info(line.style)[1]: # Fixed styles have no wipe tags
+            return str(pos) + self._fade + line.text()
+        # Build the event as a list of fragments and join once at the end -
+        # repeated += on a str is quadratic on long lines
+        parts = [str(pos), self._fade]
         cur = line.start
-        for (n, s) in enumerate(line.syllables):
-            delay = s.start - cur
-            dur = s.end - s.start
+        syls = line.syllables
+        last = len(syls) - 1
+        for (n, s) in enumerate(syls):
+            # Read each timing field once per iteration
+            start = s.start
+            end = s.end
+            delay = start - cur
+            dur = end - start
 
             if delay > 0:
                 # Gap between current position and start of next syllable
-                result += r"{\k%d}" % delay
+                parts.append(f"{{\\k{delay}}}")
             elif delay < 0:
                 # Playing catchup
                 if self.allow_kt:
                     # Reset time so wipes can overlap (\kt takes a time in centiseconds from line start)
-                    result += r"{\kt%d}" % (s.start - line.start)
+                    parts.append(f"{{\\kt{start - line.start}}}")
                 else:
                     # Shorten syllable to compensate for missing time (keep in mind delay is negative)
                     dur += delay
@@ -233,24 +278,27 @@ class AssConverter:
             # By default a syllable ends 1 centisecond before the next, so
             # special casing so we don't need a bunch of \k1 and the slight
             # errors don't catch up with us on a long line
-            if len(line.syllables) > n+1 and line.syllables[n+1].start - s.end == 1:
+            if n < last and syls[n+1].start - end == 1:
                 dur += 1
 
             # Using == False explicitly because it's technically a tri-state with None meaning undefined
             # Though that scenario shouldn't come up since we are allowing KBPFile to resolve wipedetail
             wipe = r"\k" if s.isprogressive() == False else r"\kf"
 
-            result += r"{%s%d}%s" % (wipe, dur, s.syllable)
-            cur = s.start + dur
-        return result
+            parts.append(f"{{{wipe}{dur}}}{s.syllable}")
+            cur = start + dur
+        return "".join(parts)
 
     @validators.validated_types
     @staticmethod
     def ass_style_name(index: int, kbpName: str):
         return f"Style{abs(index):02}_{kbpName}"
 
-    @validators.validated_types(coerce_types=False)
+    # Palettes are immutable and a conversion only sees a handful of distinct
+    # colors, so memoizing avoids repeating the hex expansion
     @staticmethod
+    @functools.lru_cache(maxsize=64)
+    @validators.validated_types(coerce_types=False)
     def kbp2asscolor(kbpcolor: int | str, palette: kbp.KBPPalette | types.NoneType = None, transparency: bool = False):
         alpha = "&H00"
         if isinstance(kbpcolor, int):
@@ -258,7 +306,8 @@ class AssConverter:
                 alpha = "&HFF"
             # This will intentionally raise an exception if colors are unresolved and palette is not provided
             kbpcolor = palette[kbpcolor]
-        return alpha + "".join(x+x for x in reversed(list(kbpcolor)))
+        # Reversing converts RGB to the BGR order .ass expects
+        return alpha + kbpcolor[::-1].translate(_HEX_DOUBLE)
 
     def ass_document(self):
         result = ass.Document()
@@ -280,33 +329,35 @@ class AssConverter:
 
         styles = self.kbpFile.styles
         self._calc_style_alignments()
-        for page in self.kbpFile.pages:
-            for num, line in enumerate(page.lines):
-                if line.isempty():
-                    continue
-                pos = self.get_pos(line, num)
-                line_margins = self.get_line_margins(line, pos)
-                line_style = styles[line.style]
-                result.events.append(ass.Dialogue(
-                    start=datetime.timedelta(milliseconds = line.start * 10 + self.options.offset),
-                    end=datetime.timedelta(milliseconds = line.end * 10 + self.options.offset),
-                    style=AssConverter.ass_style_name(line_style.style_no, line_style.name), # Undefined styles get default style number
-                    effect="karaoke",
-                    text=self.kbp2asstext(line, pos),
-                    margin_l=line_margins[0],
-                    margin_r=line_margins[1],
-                    ))
+        # Locals resolved once rather than per event
+        off = self.options.offset
+        def dialogue(num, line):
+            pos = self.get_pos(line, num)
+            line_margins = self.get_line_margins(line, pos)
+            return ass.Dialogue(
+                start=_MS * (line.start * 10 + off),
+                end=_MS * (line.end * 10 + off),
+                style=self._style_info(line.style)[0], # Undefined styles get default style number
+                effect="karaoke",
+                text=self.kbp2asstext(line, pos),
+                margin_l=line_margins[0],
+                margin_r=line_margins[1],
+                )
+        # One extend call instead of a list.append per line
+        result.events.extend(dialogue(num, line) for page in self.kbpFile.pages for num, line in page.nonempty_with_index())
+        palette = self.kbpFile.colors
+        transparency = self.options.transparency
         for idx in styles:
             style = styles[idx]
             result.styles.append(ass.Style(
                 name=AssConverter.ass_style_name(idx, style.name),
                 fontname=style.fontname,
                 fontsize=AssConverter.rescale_scalar(style.fontsize, self.target_x, self.target_y, font = True, border=self.border),
-                secondary_color=AssConverter.kbp2asscolor(style.textcolor, palette=self.kbpFile.colors, transparency=self.options.transparency),
-                primary_color=AssConverter.kbp2asscolor(style.textwipecolor, palette=self.kbpFile.colors, transparency=self.options.transparency),
-                outline_color=AssConverter.kbp2asscolor(style.outlinecolor, palette=self.kbpFile.colors, transparency=self.options.transparency),
+                secondary_color=AssConverter.kbp2asscolor(style.textcolor, palette=palette, transparency=transparency),
+                primary_color=AssConverter.kbp2asscolor(style.textwipecolor, palette=palette, transparency=transparency),
+                outline_color=AssConverter.kbp2asscolor(style.outlinecolor, palette=palette, transparency=transparency),
                 # NOTE: no outline wipe in .ass
-                back_color=AssConverter.kbp2asscolor(style.outlinewipecolor, palette=self.kbpFile.colors, transparency=self.options.transparency),
+                back_color=AssConverter.kbp2asscolor(style.outlinewipecolor, palette=palette, transparency=transparency),
                 bold = 'B' in style.fontstyle,
                 italic = 'I' in style.fontstyle,
                 underline = 'U' in style.fontstyle,
@@ -317,7 +368,7 @@ class AssConverter:
                 margin_r = 0, # TODO cont: Potentially could also be set by style like alignment based on most-used positions
                 margin_v = 0,
                 encoding = style.charset,
-                alignment=AssAlignment[self.style_alignments.get(kbp.KBPStyleCollection.key2alpha(idx), 'C')].value,
+                alignment=_ALIGN_ENUM[self.style_alignments.get(kbp.KBPStyleCollection.key2alpha(idx), 'C')].value,
                 ))
             
         return result
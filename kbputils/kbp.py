@@ -1,4 +1,5 @@
 import collections
+import dataclasses
 import re
 import string
 import typing
@@ -7,6 +8,22 @@ import warnings
 import os.path
 from . import validators
 
+# Line header within a page, e.g. C/A/90/445/0/0/0 (only the last 3 fields can
+# be negative). Compiled once, with the repetition groups written out so the
+# engine doesn't track group captures while matching every candidate line.
+_LINE_HEADER_RE = re.compile(r"[LCR]/[a-zA-Z]/\d+/\d+/-?\d+/-?\d+/-?\d+\Z")
+
+# Palette entries are exactly three uppercase hex digits
+_COLOR3_RE = re.compile(r"[0-9A-F]{3}\Z")
+
+# Doubles each hex digit, turning a 3-digit palette color into 6-digit RGB
+_HEX_DOUBLE = str.maketrans({c: c + c for c in "0123456789ABCDEF"})
+
+# Style letters used in line headers mapped to the style numbers used in
+# definitions (uppercase -> positive, lowercase -> negative, i.e. fixed)
+_ALPHA2KEY = {c: n + 1 for n, c in enumerate(string.ascii_uppercase)}
+_ALPHA2KEY |= {c: -(n + 1) for n, c in enumerate(string.ascii_lowercase)}
+
 class KBPFile:
 
     DIVIDER = "-----------------------------"
@@ -21,6 +38,10 @@ class KBPFile:
         "'--- Template Information ---",
         "\n"
     ))
+    # Only the values change between writes, so the section labels are baked
+    # into format constants
+    MARGINS_FORMAT = "'Margins : L,R,T,Line Spacing\n  %d,%d,%d,%d\n\n"
+    OTHER_FORMAT = "'Other: Border Colour,Detail Level\n  %d,%d\n\n"
 
     def __init__(self, kbpFile=None, **kwargs):
         self.pages = []
@@ -31,70 +52,84 @@ class KBPFile:
             self.margins = {'left': 2, 'right': 2, 'top': 7, 'spacing': 12}
             self.other = {'bordercolor': 0, 'wipedetail': 2}
             return
-        needsclosed = False
-        if not isinstance(kbpFile, io.IOBase):
+        if isinstance(kbpFile, io.IOBase):
+            raw = kbpFile.read()
+        else:
             self.filename = kbpFile
-            kbpFile = open(kbpFile, "r", encoding="utf-8")
-            needsclosed = True
-        self.parse([x.rstrip() for x in kbpFile.readlines()], **kwargs)
-        if needsclosed:
-            kbpFile.close()
+            # One binary read plus one decode skips the TextIOWrapper line
+            # machinery entirely; splitlines below handles \r\n itself
+            with open(kbpFile, "rb") as f:
+                raw = f.read().decode("utf-8")
+        # splitlines drops the newlines in one C-level pass; rstrip still runs
+        # per line (via map, so no comprehension frame) in case of stray
+        # trailing whitespace
+        self.parse(list(map(str.rstrip, raw.splitlines())), **kwargs)
 
     def parse(self, kbpLines, resolve_colors=False, resolve_wipe=True):
-        in_header = False
-        divider = False
-        for x, line in enumerate(kbpLines):
-            if in_header:
-                if line.startswith("'Palette Colours"):
-                    self.colors = KBPPalette.from_string(kbpLines[x+1])
-                elif line.startswith("'Styles"):
-                    data = kbpLines[x+1:kbpLines.index("  StyleEnd", x+1)]
-                    opts = {"palette": self.colors} if resolve_colors else {}
-                    self.styles = KBPStyleCollection.from_textlines([x for x in data if not x.startswith("'")], **opts)
-                elif line.startswith("'Margins"):
-                    self.parse_margins(kbpLines[x+1])
-                elif line.startswith("'Other"):
-                    self.parse_other(kbpLines[x+1])
-                elif line == "'--- Track Information ---":
-                    data = kbpLines[x+1:kbpLines.index(KBPFile.DIVIDER, x+1)]
-                    self.parse_trackinfo(data)
-                    if self.trackinfo["Status"] != '1':
-                        raise NotImplementedError("Tracks must be synced before they can be used with kbputils.")
-
-            elif divider and line == "PAGEV2":
-                data = kbpLines[x+1:kbpLines.index(KBPFile.DIVIDER, x+1)]
+        # One pre-pass records the DIVIDER positions, then each
+        # divider-delimited block is dispatched on its first meaningful line.
+        # Replaces the per-line in_header/divider state machine and its
+        # re-checks of the same conditions for every line of the file
+        bounds = [x for x, line in enumerate(kbpLines) if line == KBPFile.DIVIDER]
+        bounds.append(len(kbpLines))
+        for a, b in zip(bounds, bounds[1:]):
+            block = kbpLines[a+1:b]
+            # Remember where the keyword was found so the block isn't rescanned
+            # with .index below
+            n, keyword = next(((n, l) for n, l in enumerate(block) if l != "" and not l.startswith("'")), (None, None))
+            if keyword == "HEADERV2":
+                self.parse_header(block, resolve_colors)
+            elif keyword == "PAGEV2":
                 opts = {"default_wipe": self.other['wipedetail']} if resolve_wipe else {}
-                self.pages.append(KBPPage.from_textlines(data, **opts))
-
-            elif divider and line == "IMAGE":
+                self.pages.append(KBPPage.from_textlines(block, n + 1, **opts))
+            elif keyword == "IMAGE":
                 # TODO: Determine if it's ever possible to have multiple image lines in one section
-                data = kbpLines[x+1]
-                self.images.append(KBPImage.from_string(data))
-
-            if divider and line == "HEADERV2":
-                in_header = True
+                self.images.append(KBPImage.from_string(block[n + 1]))
 
-            if line == KBPFile.DIVIDER:
-                in_header = False
-                divider = True
-            # Ignore empty/comment lines and still consider the previous line to be a divider
-            elif line != "" and not line.startswith("'"):
-                divider = False
-
-        missing = ', '.join(filter(lambda x: not hasattr(self, x), ('colors', 'styles', 'margins', 'other','pages')))
+        missing = ', '.join(x for x in ('colors', 'styles', 'margins', 'other', 'pages') if not hasattr(self, x))
         if missing:
             raise ValueError(f"Invalid KBP file, missing sections: {missing}")
 
         if not hasattr(self, 'trackinfo'):
             warnings.warn("No track info present, is this a template?")
 
-    
+    # Parse the sections of a HEADERV2 block (palette, styles, margins, other,
+    # track info); the block already ends at the next divider
+    def parse_header(self, data, resolve_colors=False):
+        def styles(x):
+            styledata = data[x+1:data.index("  StyleEnd", x+1)]
+            opts = {"palette": self.colors} if resolve_colors else {}
+            # Strip the indentation here so the per-line lstrips inside
+            # from_textlines become no-ops
+            self.styles = KBPStyleCollection.from_textlines([y.lstrip() for y in styledata if not y.startswith("'")], **opts)
+        def trackinfo(x):
+            if data[x] != "'--- Track Information ---":
+                return # the template information banner shares this token
+            self.parse_trackinfo(data[x+1:])
+            if self.trackinfo["Status"] != '1':
+                raise NotImplementedError("Tracks must be synced before they can be used with kbputils.")
+        # Marker lines are identified by their first token with a single dict
+        # lookup instead of a chain of prefix comparisons per line
+        dispatch = {
+            "'Palette": lambda x: setattr(self, "colors", KBPPalette.from_string(data[x+1])),
+            "'Styles": styles,
+            "'Margins": lambda x: self.parse_margins(data[x+1]),
+            "'Other:": lambda x: self.parse_other(data[x+1]),
+            "'---": trackinfo,
+        }
+        for x, line in enumerate(data):
+            if line and (handler := dispatch.get(line.partition(" ")[0])):
+                handler(x)
+
+
 
     def parse_margins(self, margin_line):
-        self.margins = dict(zip(("left", "right", "top", "spacing"), (int(x) for x in margin_line.strip().split(","))))
+        left, right, top, spacing = map(int, margin_line.strip().split(","))
+        self.margins = {"left": left, "right": right, "top": top, "spacing": spacing}
 
     def parse_other(self, other_line):
-        self.other = dict(zip(("bordercolor", "wipedetail"), (int(x) for x in other_line.strip().split(","))))
+        bordercolor, wipedetail = map(int, other_line.strip().split(","))
+        self.other = {"bordercolor": bordercolor, "wipedetail": wipedetail}
 
     # This is formatted in a way that it may allow freeform key/value pairs, so
     # leaving this as just a dict, but so far it always seems to contain exactly:
@@ -138,35 +173,33 @@ class KBPFile:
     def writeFile(self, kbpFile, allow_overwrite=False):
         if any(x.has_colors() for x in self.styles.values()):
             raise ValueError("Unable to write styles when they contain arbitrary colors. They must use palette indexes.")
+        needsclosed = False
         if not isinstance(kbpFile, io.IOBase):
             if not allow_overwrite and os.path.exists(kbpFile) and hasattr(self,'filename') and os.path.samefile(kbpFile, self.filename):
                 raise ValueError("Refusing to write back to original filename. Set allow_overwrite if you need to do so.")
             kbpFile = open(kbpFile, "w", encoding="utf-8",newline="\r\n")
             needsclosed = True
-        kbpFile.write(KBPFile.HEADER_START)
-        kbpFile.write(self.colors.toKBP())
-        kbpFile.write(self.styles.toKBP())
-        kbpFile.write("\n  ".join((
-            "'Margins : L,R,T,Line Spacing",
-            ",".join(str(x) for x in self.margins.values())
-        )) + "\n\n")
-        kbpFile.write("\n  ".join((
-            "'Other: Border Colour,Detail Level",
-            ",".join(str(x) for x in self.other.values())
-        )) + "\n\n")
+        # Collect the fragments and write once so the buffered writer gets one
+        # big string instead of a Python-level write call per page and image
+        parts = [
+            KBPFile.HEADER_START,
+            self.colors.toKBP(),
+            self.styles.toKBP(),
+            KBPFile.MARGINS_FORMAT % tuple(self.margins.values()),
+            KBPFile.OTHER_FORMAT % tuple(self.other.values()),
+        ]
 
         if hasattr(self, 'trackinfo'):
-            kbpFile.write("'--- Track Information ---\n\n")
-            kbpFile.write("\n".join(f"""{'\n' if x == 'Comments' else ''}{x:<10}{
+            parts.append("'--- Track Information ---\n\n")
+            parts.append("\n".join(f"""{'\n' if x == 'Comments' else ''}{x:<10}{
                 ('\n' + ' ' * 10).join(self.trackinfo[x].split('\n'))
             }""" for x in self.trackinfo) + "\n\n")
-            for page in self.pages:
-                kbpFile.write(page.toKBP())
-            for image in self.images:
-                kbpFile.write(image.toKBP())
+            parts.extend(page.toKBP() for page in self.pages)
+            parts.extend(image.toKBP() for image in self.images)
         # else template
 
-        kbpFile.write(KBPFile.DIVIDER + "\n\n")
+        parts.append(KBPFile.DIVIDER + "\n\n")
+        kbpFile.write("".join(parts))
 
         if needsclosed:
             kbpFile.close()
@@ -182,7 +215,7 @@ class KBPPalette(collections.namedtuple("KBPPalette", tuple(range(16)), rename=T
     
     # namedtuple-generated classes don't have __init__ so must instead override __new__
     def __new__(cls, *colors):
-        assert len(colors) == 16 and all(re.match(r"[0-9A-F]{3}$", x) for x in colors)
+        assert len(colors) == 16 and all(_COLOR3_RE.match(x) for x in colors)
         return super().__new__(cls, *colors)
 
     # Hide the field names because they are just _0 to _15 and aren't going to be used directly
@@ -190,8 +223,10 @@ class KBPPalette(collections.namedtuple("KBPPalette", tuple(range(16)), rename=T
         return "KBPPalette(" + ", ".join(repr(x) for x in self) + ")"
 
     def __getitem__(self, x):
+        # The tuple already stores the colors in index order, so fetch
+        # directly rather than formatting a _N attribute name
         if isinstance(x, int) and 0 <= x < 16:
-            return getattr(self, f"_{x}")
+            return tuple.__getitem__(self, x)
         else:
             raise KeyError(x)
 
@@ -204,13 +239,14 @@ class KBPPalette(collections.namedtuple("KBPPalette", tuple(range(16)), rename=T
         return f"'Palette Colours (0-15)\n  {",".join(self)}\n\n"
 
     def as_rgb24(self):
-        return ["".join(y * 2 for y in x) for x in self]
+        return [x.translate(_HEX_DOUBLE) for x in self]
 
     def as_rgba32(self):
         return [x+"FF" for x in self.as_rgb24()]
 
-@validators.validated_instantiation
-class KBPLineHeader(typing.NamedTuple):
+@validators.validated_instantiation(replace="__init__")
+@dataclasses.dataclass(slots=True)
+class KBPLineHeader:
     align: str
     style: str
     start: int
@@ -223,10 +259,11 @@ class KBPLineHeader(typing.NamedTuple):
         return self.style.islower()
 
     def toKBP(self):
-        return "/".join(str(x) for x in self)
+        return f"{self.align}/{self.style}/{self.start}/{self.end}/{self.right}/{self.down}/{self.rotation}"
 
-@validators.validated_instantiation
-class KBPSyllable(typing.NamedTuple):
+@validators.validated_instantiation(replace="__init__")
+@dataclasses.dataclass(slots=True)
+class KBPSyllable:
     syllable: str
     start: int
     end: int
@@ -241,22 +278,86 @@ class KBPSyllable(typing.NamedTuple):
         return None if self.wipe == 0 else (self.wipe < 5)
 
     def toKBP(self):
-        return f"{self.syllable + '/ ':<15}" + "/".join(str(x) for x in self[1:])
+        return f"{self.syllable + '/ ':<15}{self.start}/{self.end}/{self.wipe}"
+
+# A slotted class rather than a NamedTuple so emptiness and rendered text can
+# be cached; lines are still treated as immutable once constructed
+class KBPLine:
+    __slots__ = ("header", "syllables", "_empty", "_text_cache")
+
+    def __init__(self, header, syllables):
+        object.__setattr__(self, "header", header)
+        object.__setattr__(self, "syllables", syllables)
+        object.__setattr__(self, "_empty", not syllables or (len(syllables) == 1 and syllables[0].isempty()))
+        object.__setattr__(self, "_text_cache", {})
+
+    def __repr__(self):
+        return f"KBPLine(header={self.header!r}, syllables={self.syllables!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, KBPLine) and self.header == other.header and self.syllables == other.syllables
+
+    # Explicit pass-throughs for the header fields hit in hot loops, so those
+    # reads don't pay the __getattr__ trampoline below
+    @property
+    def align(self):
+        return self.header.align
+
+    @property
+    def style(self):
+        return self.header.style
+
+    @property
+    def start(self):
+        return self.header.start
+
+    @property
+    def end(self):
+        return self.header.end
+
+    @property
+    def right(self):
+        return self.header.right
 
-class KBPLine(typing.NamedTuple):
-    header: KBPLineHeader
-    syllables: list
+    @property
+    def down(self):
+        return self.header.down
+
+    @property
+    def rotation(self):
+        return self.header.rotation
 
     # There's only one header, so may as well pass anything unresolved down to it
     def __getattr__(self, attr):
-        return getattr(self.header, attr)
-
-    # These will just return "can't set" errors since it's immutable, but that
-    # makes more sense than "has no attribute"
+        # Fetch the header without re-entering this method so a partially
+        # constructed instance (e.g. mid-unpickle) raises instead of recursing
+        try:
+            header = object.__getattribute__(self, "header")
+        except AttributeError:
+            raise AttributeError(attr) from None
+        return getattr(header, attr)
+
+    # Keep the namedtuple-style immutability
     def __setattr__(self, attr, val):
-        return setattr(self.header, attr, val)
+        raise AttributeError(f"can't set attribute {attr!r}")
+
+    # Explicit state methods - the default protocol can't restore the slots
+    # through the blocking __setattr__ above
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in KBPLine.__slots__}
+
+    def __setstate__(self, state):
+        for slot, val in state.items():
+            object.__setattr__(self, slot, val)
 
+    # Memoized - repeated full-file text renders reuse the per-line result
     def text(self, syllable_separator="", space_is_separator=False):
+        key = (syllable_separator, space_is_separator)
+        if (result := self._text_cache.get(key)) is None:
+            result = self._text_cache[key] = self._render_text(syllable_separator, space_is_separator)
+        return result
+
+    def _render_text(self, syllable_separator, space_is_separator):
 
         # Special case for empty lines because when importing lyrics into KBS,
         # a syllable separator by itself is used to denote an empty line (as
@@ -267,27 +368,31 @@ class KBPLine(typing.NamedTuple):
         # When space is considered a separator, underscore is used to represent
         # a non-splitting space
         elif space_is_separator and syllable_separator != "":
-            result = ""
+            parts = []
             for syl in self.syllables:
-                syltext = syl.syllable
-                syltext = re.sub(r"( +)(?=[^ ])", lambda m: "_" * len(m.group(1)), syltext)
-                result += syltext
+                # Every space run except a trailing one precedes a non-space,
+                # so underscore everything left of the trailing run
+                text = syl.syllable
+                stripped = text.rstrip(" ")
+                syltext = stripped.replace(" ", "_") + text[len(stripped):]
+                parts.append(syltext)
                 if not syltext.endswith(" "):
-                    result += syllable_separator
-            return result[:-len(syllable_separator)]
+                    parts.append(syllable_separator)
+            return "".join(parts)[:-len(syllable_separator)]
 
         # Basic case - output syllables split only by the separator character(s)
         else:
             return syllable_separator.join(x.syllable for x in self.syllables)
 
     def isempty(self):
-        return not self.syllables or (len(self.syllables) == 1 and self.syllables[0].isempty())
+        return self._empty
 
     def toKBP(self):
         return "\n".join((self.header.toKBP(), *(x.toKBP() for x in self.syllables))) + "\n"
 
-@validators.validated_instantiation
-class KBPStyle(typing.NamedTuple):
+@validators.validated_instantiation(replace="__init__")
+@dataclasses.dataclass(slots=True)
+class KBPStyle:
     style_no: int
     name: str
     textcolor: str | int
@@ -305,22 +410,36 @@ class KBPStyle(typing.NamedTuple):
     fixed: bool
 
     def has_colors(self):
-        fields = ("textcolor", "outlinecolor", "textwipecolor", "outlinewipecolor")
-        if all(isinstance(getattr(self,x), str) for x in fields):
+        colors = (self.textcolor, self.outlinecolor, self.textwipecolor, self.outlinewipecolor)
+        if all(isinstance(x, str) for x in colors):
             return True
-        elif all(isinstance(getattr(self,x), int) for x in fields):
+        elif all(isinstance(x, int) for x in colors):
             return False
         else:
-            raise TypeError("Mixed/unexpected types found in color parameters:\n\t" + 
-                "\n\t".join([": ".join((x, str(getattr(self,x)))) for x in fields]))
+            raise TypeError("Mixed/unexpected types found in color parameters:\n\t" +
+                "\n\t".join(f"{name}: {val}" for name, val in zip(("textcolor", "outlinecolor", "textwipecolor", "outlinewipecolor"), colors)))
 
     def resolve_colors(style, palette):
         if style.has_colors():
             warnings.warn(f"Colors were already resolved on style {name}. Palette may not be used as intended", RuntimeWarning)
             return style
         else:
-            fields = ("textcolor", "outlinecolor", "textwipecolor", "outlinewipecolor")
-            return style._replace(**dict((x, palette[getattr(style,x)]) for x in fields))
+            return KBPStyle(
+                style.style_no,
+                style.name,
+                palette[style.textcolor],
+                palette[style.outlinecolor],
+                palette[style.textwipecolor],
+                palette[style.outlinewipecolor],
+                style.fontname,
+                style.fontsize,
+                style.fontstyle,
+                style.charset,
+                style.outlines,
+                style.shadows,
+                style.wipestyle,
+                style.allcaps,
+                style.fixed)
 
     # Create a "fixed" version of a style (no wiping)
     # Technically the wipe colors are still defined with their original values,
@@ -330,19 +449,28 @@ class KBPStyle(typing.NamedTuple):
         if style.fixed:
             return style
         else:
-            return style._replace(
-                name = style.name + "_fixed",
-                style_no = -style.style_no,
-                textwipecolor = style.textcolor,
-                outlinewipecolor = style.outlinecolor,
-                fixed = True)
+            return KBPStyle(
+                -style.style_no,
+                style.name + "_fixed",
+                style.textcolor,
+                style.outlinecolor,
+                style.textcolor, # wipe colors redefined to the non-wiped ones
+                style.outlinecolor,
+                style.fontname,
+                style.fontsize,
+                style.fontstyle,
+                style.charset,
+                style.outlines,
+                style.shadows,
+                style.wipestyle,
+                style.allcaps,
+                True)
 
     def toKBP(self):
-        tmp = tuple(str(x) for x in self)
         return "\n    ".join((
-            ",".join((f"  Style{(self.style_no - 1):02d}",) + tmp[1:6]),
-            ",".join(tmp[6:10]),
-            ",".join(tuple(str(x) for x in self.outlines) + tuple(str(x) for x in self.shadows) + tmp[12:14])
+            f"  Style{(self.style_no - 1):02d},{self.name},{self.textcolor},{self.outlinecolor},{self.textwipecolor},{self.outlinewipecolor}",
+            f"{self.fontname},{self.fontsize},{self.fontstyle},{self.charset}",
+            ",".join((*(str(x) for x in self.outlines), *(str(x) for x in self.shadows), str(self.wipestyle), self.allcaps))
         )) + "\n\n"
 
 class KBPStyleCollection(dict):
@@ -363,19 +491,18 @@ class KBPStyleCollection(dict):
     # Alias style letters used in line headers to style numbers used in definition
     @staticmethod
     def alpha2key(alpha):
-        if alpha in list(string.ascii_uppercase):
-            return string.ascii_uppercase.index(alpha)+1
-        elif alpha in list(string.ascii_lowercase):
-            return -string.ascii_lowercase.index(alpha)-1
+        return _ALPHA2KEY.get(alpha)
 
     def __missing__(self, key):
-        if key in list(string.ascii_letters):
-            return self[KBPStyleCollection.alpha2key(key)]
+        if (num := _ALPHA2KEY.get(key)) is not None:
+            return self[num]
 
-        # Auto-vivify fixed styles
+        # Auto-vivify fixed styles. The fixed copy is derived from an
+        # already-validated entry, so skip the __setitem__ validator stack
         elif isinstance(key, int) and -key in self.keys():
-            self[key] = self[-key].make_fixed()
-            return self[key]
+            fixed = self[-key].make_fixed()
+            dict.__setitem__(self, key, fixed)
+            return fixed
 
         # Undefined styles should return the default style
         # The caller can determine this happened if needed by
@@ -435,34 +562,44 @@ class KBPStyleCollection(dict):
     @staticmethod
     def from_textlines(style_lines, palette=None):
         styles = KBPStyleCollection()
-        fields = {}
-        style_no = None
-        for n, line in enumerate(style_lines):
-            line = line.lstrip()
-            if line == "" and style_no is not None:
-                style_no = None
-                fields = {}
-            elif style_no is None and line.startswith("Style"):
-                tmp = line.split(",")
-                style_no = int(tmp[0][5:]) + 1
-                fields['style_no'] = style_no
-                tmp = [tmp[1], *(int(x) for x in tmp[2:])]
-                fields.update(dict(zip(("name", "textcolor", "outlinecolor", "textwipecolor", "outlinewipecolor"),tmp)))
-                tmp = style_lines[n+1].lstrip().split(",")
-                tmp[1] = int(tmp[1])
-                tmp[3] = int(tmp[3])
-                fields.update(dict(zip(("fontname", "fontsize", "fontstyle", "charset"),tmp)))
-                tmp = style_lines[n+2].lstrip().split(",")
-                tmp[:-1] = [int(x) for x in tmp[:-1]]
-                fields.update(dict(zip(("outlines", "shadows", "wipestyle", "allcaps", "fixed"),(tmp[:4],tmp[4:6],tmp[6],tmp[7],False))))
-                result = KBPStyle(**fields)
-                if palette:
-                    result = result.resolve_colors(palette)
+        n = 0
+        total = len(style_lines)
+        while n < total:
+            # lstrip returns the string itself when there's nothing to strip,
+            # so pre-stripped callers (like parse_header) pay nothing here
+            # while lines straight off disk still parse
+            line = style_lines[n].lstrip()
+            if line.startswith("Style"):
+                name_line = line.split(",", 5)
+                font = style_lines[n+1].lstrip().split(",", 3)
+                other = style_lines[n+2].lstrip().split(",", 7)
                 # Adding 1 to style for 2 reasons:
                 # - Style 0/A is shown in the KBS UI as 01
                 # - It allows indexing fixed styles as negative numbers
+                style_no = int(name_line[0][5:]) + 1
+                # Resolving palette indexes inline avoids the _replace rebuild
+                # resolve_colors would do on the freshly made style
+                if palette:
+                    colors = (palette[int(x)] for x in name_line[2:6])
+                else:
+                    colors = (int(x) for x in name_line[2:6])
+                result = KBPStyle(
+                    style_no,
+                    name_line[1],
+                    *colors,
+                    font[0],
+                    int(font[1]),
+                    font[2],
+                    int(font[3]),
+                    [int(x) for x in other[:4]],
+                    [int(other[4]), int(other[5])],
+                    int(other[6]),
+                    other[7],
+                    False)
                 styles[style_no] = result
-            # else second/third line of styles already processed
+                n += 3 # font and other lines consumed above
+            else: # blank separator (or stray line) between style blocks
+                n += 1
         return styles
     
     
@@ -478,55 +615,92 @@ class KBPStyleCollection(dict):
     # for x in kbpfile.styles.alpha_keys():
     #     ...
     def alpha_keys(self):
-        class alphakey_view:
-            def __init__(slf, obj):
-                slf.__obj = obj
+        return _alphakey_view(self.keys())
 
-            def __len__(slf):
-                return len(slf.__obj)
+    def alpha_iter(self):
+        return iter(self.alpha_keys())
 
-            def __reversed__(slf):
-                return alphakey_view(reversed(slf.__obj))
+    def toKBP(self):
+        return KBPStyleCollection.HEADER + "".join(x.toKBP() for x in self.values() if x.style_no > 0) + "  StyleEnd\n\n"
 
-            def __repr__(slf):
-                return f"style_alphakey_view({', '.join(repr(KBPStyleCollection.key2alpha(x)) for x in slf.__obj)})"
 
-            def __iter__(slf):
-                class alphakey_iterator:
-                    def __init__(sf, it):
-                        sf.__iter = it
-                    def __repr__(sf):
-                        return f"<style_alphakey_iterator at {hex(id(sf))}>"
-                    def __next__(sf):
-                        return next(sf.__iter)
-                return alphakey_iterator(KBPStyleCollection.key2alpha(x) for x in slf.__obj)
+# Defined at module scope so alpha_keys doesn't pay for creating two class
+# objects on every call
+class _alphakey_view:
+    def __init__(slf, obj):
+        slf.__obj = obj
 
-        return alphakey_view(self.keys())
+    def __len__(slf):
+        return len(slf.__obj)
 
-    def alpha_iter(self):
-        return iter(self.alpha_keys())
+    def __reversed__(slf):
+        return _alphakey_view(reversed(slf.__obj))
 
-    def toKBP(self):
-        return KBPStyleCollection.HEADER + "".join(x.toKBP() for x in self.values() if x.style_no > 0) + "  StyleEnd\n\n"
-        
+    def __repr__(slf):
+        return f"style_alphakey_view({', '.join(repr(KBPStyleCollection.key2alpha(x)) for x in slf.__obj)})"
 
-@validators.validated_instantiation
-class KBPPage(typing.NamedTuple):
+    def __iter__(slf):
+        return _alphakey_iterator(KBPStyleCollection.key2alpha(x) for x in slf.__obj)
+
+class _alphakey_iterator:
+    def __init__(sf, it):
+        sf.__iter = it
+    def __repr__(sf):
+        return f"<style_alphakey_iterator at {hex(id(sf))}>"
+    def __next__(sf):
+        return next(sf.__iter)
+
+# A slotted class rather than a NamedTuple so the page timing bounds can be
+# cached; pages are still treated as immutable once constructed
+@validators.validated_instantiation(replace="__init__")
+class KBPPage:
     remove: str
     display: str
     lines: list
 
+    __slots__ = ("remove", "display", "lines", "_start", "_end")
+
+    def __init__(self, remove, display, lines):
+        object.__setattr__(self, "remove", remove)
+        object.__setattr__(self, "display", display)
+        object.__setattr__(self, "lines", lines)
+        object.__setattr__(self, "_start", None)
+        object.__setattr__(self, "_end", None)
+
+    def __repr__(self):
+        return f"KBPPage(remove={self.remove!r}, display={self.display!r}, lines={self.lines!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, KBPPage) and (self.remove, self.display, self.lines) == (other.remove, other.display, other.lines)
+
+    # Keep the namedtuple-style immutability
+    def __setattr__(self, attr, val):
+        raise AttributeError(f"can't set attribute {attr!r}")
+
+    # Explicit state methods - the default protocol can't restore the slots
+    # through the blocking __setattr__ above
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in KBPPage.__slots__}
+
+    def __setstate__(self, state):
+        for slot, val in state.items():
+            object.__setattr__(self, slot, val)
+
+    # start lets the caller hand over its divider-delimited block as-is
+    # instead of allocating a trimmed copy of it per page
     @staticmethod
-    def from_textlines(page_lines, default_wipe = None):
+    def from_textlines(page_lines, start=0, default_wipe=None):
         lines=[]
         syllables=[]
         header=None
         transitions=["", ""] # Default line by line
-        for x in page_lines:
-            if header is None and re.match(r"[LCR]/[a-zA-Z](/\d+){2}(/-?\d+){3}$", x): # Only last 3 fields can be negative
-                fields = x.split("/")
-                fields[2:] = [int(y) for y in fields[2:]]
-                header = KBPLineHeader(**dict(zip(("align", "style", "start", "end", "right", "down", "rotation"), fields)))
+        for i in range(start, len(page_lines)):
+            x = page_lines[i]
+            # The two-character test screens out syllable and FX lines before
+            # paying for the regex engine (slicing x[1:2] is safe on short lines)
+            if header is None and x[1:2] == "/" and x[0] in "LCR" and _LINE_HEADER_RE.match(x):
+                align, style, start, end, right, down, rotation = x.split("/", 6)
+                header = KBPLineHeader(align, style, int(start), int(end), int(right), int(down), int(rotation))
             elif x == "" and header is not None:
                 # Handle previous line
                 lines.append(KBPLine(header=header, syllables=syllables))
@@ -535,28 +709,58 @@ class KBPPage(typing.NamedTuple):
             elif header is None and x.startswith("FX/"):
                 transitions = x.split('/')[1:]
             elif x != "":
-                fields = x.split("/")
-                fields[0] = re.sub(r"{-}", "/", fields[0]) # This field uses this as a surrogate for / since that denotes end of syllable
-                fields[1] = fields[1].lstrip() # Only the second field should have extra spaces
-                fields[1:] = [int(y) for y in fields[1:]]
-                if default_wipe and fields[3] == 0:
-                    fields[3] = default_wipe
-                syllables.append(KBPSyllable(**dict(zip(("syllable", "start", "end", "wipe"), fields))))
+                syl, start, end, wipe = x.split("/", 3)
+                if "{-}" in syl: # Surrogate for / since that denotes end of syllable
+                    syl = syl.replace("{-}", "/")
+                wipe = int(wipe)
+                if default_wipe and wipe == 0:
+                    wipe = default_wipe
+                # int() tolerates the padding spaces on the start field
+                syllables.append(KBPSyllable(syl, int(start), int(end), wipe))
         return KBPPage(*transitions, lines)
 
+    # Yield (num, line) for lines with content, keeping the original index so
+    # callers can still compute vertical position from the line number
+    def nonempty_with_index(self):
+        for num, line in enumerate(self.lines):
+            if not line.isempty():
+                yield num, line
+
+    # Memoized - pages don't change after parse, so one pass over the lines
+    # computes both extrema and the scan never runs again
+    def _scan_span(self):
+        start = end = None
+        for line in self.lines:
+            hdr = line.header
+            if not line._empty and (start is None or hdr.start < start):
+                start = hdr.start
+            if end is None or hdr.end > end:
+                end = hdr.end
+        object.__setattr__(self, "_start", start)
+        object.__setattr__(self, "_end", end)
+
     def get_start(self):
-        return min(line.start for line in self.lines if not line.isempty())
+        if self._start is None:
+            self._scan_span()
+            if self._start is None:
+                raise ValueError("Page has no non-empty lines")
+        return self._start
 
     def get_end(self):
-        return max(line.end for line in self.lines)
+        if self._end is None:
+            self._scan_span()
+            if self._end is None:
+                raise ValueError("Page has no lines")
+        return self._end
 
     def toKBP(self):
         transition = (f"FX/{self.remove}/{self.display}\n",) if (self.remove or self.display) else ()
         return "\n".join((KBPFile.DIVIDER, "PAGEV2", *transition, *(x.toKBP() for x in self.lines))) + "\n"
 
 # Perhaps this could be better named as slideshow, but calling it IMAGE as that's what the header is called in the .kbp
-@validators.validated_instantiation
-class KBPImage(typing.NamedTuple):
+@validators.validated_instantiation(replace="__init__")
+@dataclasses.dataclass(slots=True)
+class KBPImage:
     start: int
     end: int
     filename: str
@@ -564,10 +768,8 @@ class KBPImage(typing.NamedTuple):
 
     @staticmethod
     def from_string(image_line):
-        fields = image_line.split("/")
-        for x in (0, 1, 3):
-            fields[x] = int(fields[x])
-        return KBPImage(**dict(zip(("start", "end", "filename", "leaveonscreen"),fields)))
+        start, end, filename, leaveonscreen = image_line.split("/", 3)
+        return KBPImage(int(start), int(end), filename, int(leaveonscreen))
 
     def toKBP(self):
-        return "\n".join((KBPFile.DIVIDER, "IMAGE", "/".join(str(x) for x in self))) + "\n\n"
+        return "\n".join((KBPFile.DIVIDER, "IMAGE", f"{self.start}/{self.end}/{self.filename}/{self.leaveonscreen}")) + "\n\n"
@@ -3,9 +3,11 @@ import sys
 
 
 def _fetch_offset():
-    if os.environ.get('APPDATA') and os.path.exists(p := os.path.join(os.environ['APPDATA'], 'Karaoke Builder', 'data_studio.ini')):
+    if appdata := os.environ.get('APPDATA'):
+        # Just attempt the open - a missing file lands in the except below,
+        # saving the separate exists() stat
         try:
-            with open(p, 'r') as f:
+            with open(os.path.join(appdata, 'Karaoke Builder', 'data_studio.ini'), 'r') as f:
                 for line in f:
                     field, val = line.split(maxsplit=1)
                     if field == "setoffset":
@@ -43,7 +43,12 @@ def one_arg(func=None, /, **kwargs):
 # function
 def validated_types(func=None, /, *, coerce_types=True):
     def validated_types_generator(func):
+        # Flatten the signature into (name, annotation) pairs once at
+        # decoration time so the wrapper doesn't walk the inspect machinery
+        # and hash parameter names on every call
         signature = inspect.signature(func)
+        params = tuple((name, p.annotation) for name, p in signature.parameters.items())
+        return_annotation = signature.return_annotation
 
         @functools.wraps(func)
         def validate_wrapper(*args, **kwargs):
@@ -51,7 +56,7 @@ def validated_types(func=None, /, *, coerce_types=True):
             if coerce_types:
                 args = list(args)
             pos_idx = 0
-            for param in signature.parameters:
+            for param, t in params:
                 comp = None
                 setter = None
                 if len(args) > pos_idx:
@@ -67,16 +72,16 @@ def validated_types(func=None, /, *, coerce_types=True):
                     # parameter not passed, nothing to validate
                     # function itself should validate number of parameters and
                     # whether they were option or mandatory
-                    continue 
-                if (t := signature.parameters[param].annotation) is not inspect._empty:
+                    continue
+                if t is not inspect._empty:
                     if coerce_types and not isinstance(comp, t) and callable(t):
                         # Give coercion a try...
                         setter(t(comp))
                     elif not isinstance(comp, t):
                         raise TypeError(f"{func.__qualname__} expected {param} to be of type {t.__name__}, found {type(comp).__name__}.")
             result = func(*args, **kwargs)
-            if (t := signature.return_annotation) is not inspect._empty and not isinstance(result, t):
-                raise TypeError(f"{func.__qualname__} was expected to return type {t.__name__}, found {type(result).__name__}.")
+            if return_annotation is not inspect._empty and not isinstance(result, return_annotation):
+                raise TypeError(f"{func.__qualname__} was expected to return type {return_annotation.__name__}, found {type(result).__name__}.")
             return result
         return validate_wrapper
     if func:
@@ -124,9 +129,12 @@ def validated_structures(assert_function, static=False):
 def validated_instantiation(cls=None, /, *, replace="__new__"):
     def validated_instantiation_generator(cls):
         orig_func = getattr(cls, replace)
+        # Annotations can't change after decoration, so walk the class once
+        # here instead of calling inspect.get_annotations per instantiation
+        annotations = tuple(inspect.get_annotations(cls).items())
         def validator_func(c, *args, **kwargs):
             pos_idx = 0
-            for param in (a := inspect.get_annotations(cls)):
+            for param, t in annotations:
                 comp = None
                 if(len(args) > pos_idx):
                     comp = args[pos_idx]
@@ -135,7 +143,7 @@ def validated_instantiation(cls=None, /, *, replace="__new__"):
                     comp = kwargs[param]
                 else:
                     continue
-                if not isinstance(comp, (t := a[param])):
+                if not isinstance(comp, t):
                     raise TypeError(f"{cls.__qualname__} expected {param} to be of type {t.__name__}, found {type(comp).__name__}.")
             return orig_func(c, *args, **kwargs)
         setattr(cls, replace, validator_func)